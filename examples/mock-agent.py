@@ -9,19 +9,79 @@ This example demonstrates all the generative UI capabilities:
 - Smart data visualization
 
 Usage:
+    pip install granian aiosqlite zstandard
     python examples/mock-agent.py
 
+Without granian installed the server falls back to uvicorn (install uvloop
+and httptools for its fast path).
+
+Set AGENT_RELOAD=1 to run a single auto-reloading worker during development,
+and AGENT_DEBUG=1 to turn on agno's verbose debug logging.
+
 Then connect the frontend to http://localhost:7777
 """
 
+import json
+import logging
+import os
+import sys
+import zlib
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import uvicorn
+
 from agno.agent import Agent
-from agno.db.sqlite import SqliteDb
+from agno.db.sqlite import AsyncSqliteDb
 from agno.models.anthropic import Claude
 from agno.os import AgentOS
 from agno.tools import tool
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.datastructures import Headers, MutableHeaders
 from typing import TypedDict, Literal
 
-db = SqliteDb(db_file="tmp/data.db")
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json works the same here
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # optional, responses fall back to gzip
+    zstandard = None
+
+try:
+    from granian import Granian
+    from granian.constants import HTTPModes, Interfaces
+except ImportError:  # optional, uvicorn is used instead
+    Granian = None
+
+# Verbose agno logging formats every message and streamed chunk, so it is
+# opt-in rather than always on
+DEBUG = os.getenv("AGENT_DEBUG") == "1"
+
+DB_FILE = Path("tmp/data.db")
+DB_FILE.parent.mkdir(parents=True, exist_ok=True)
+
+# aiosqlite runs every statement on its own connection thread, so session
+# reads and writes are awaited instead of blocking the event loop. WAL mode
+# keeps readers off the writer and skips the per-commit rollback-journal fsync.
+db_engine = create_async_engine(f"sqlite+aiosqlite:///{DB_FILE}")
+
+@event.listens_for(db_engine.sync_engine, "connect")
+def _configure_sqlite(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+db = AsyncSqliteDb(db_engine=db_engine)
 
 # ============================================================================
 # TYPE DEFINITIONS
@@ -59,12 +119,160 @@ class DashboardMetrics(TypedDict):
     customerTrend: str
     projectStatus: str
 
+# ============================================================================
+# MOCK DATA
+# ============================================================================
+# Built once at import time - the tools below return these directly instead
+# of rebuilding identical literals on every call.
+
+_REVENUE_MONTHLY: tuple[RevenueData, ...] = (
+    {"month": "Jan", "revenue": 5000, "expenses": 3000},
+    {"month": "Feb", "revenue": 6000, "expenses": 3500},
+    {"month": "Mar", "revenue": 7000, "expenses": 4000},
+    {"month": "Apr", "revenue": 7500, "expenses": 4200},
+    {"month": "May", "revenue": 8000, "expenses": 4500},
+    {"month": "Jun", "revenue": 8500, "expenses": 4800},
+)
+
+_REVENUE_QUARTERLY: tuple[RevenueData, ...] = (
+    {"month": "Q1", "revenue": 18000, "expenses": 10500},
+    {"month": "Q2", "revenue": 21000, "expenses": 12000},
+    {"month": "Q3", "revenue": 24000, "expenses": 13500},
+    {"month": "Q4", "revenue": 27000, "expenses": 15000},
+)
+
+# Every period the tool documents; anything else falls back to monthly.
+# The mock has no yearly figures yet, so yearly serves the monthly set.
+_REVENUE_BY_PERIOD: dict[str, tuple[RevenueData, ...]] = {
+    "monthly": _REVENUE_MONTHLY,
+    "quarterly": _REVENUE_QUARTERLY,
+    "yearly": _REVENUE_MONTHLY,
+}
+
+_RENTAL_CARS: tuple[CarData, ...] = (
+    {
+        "id": "car-1",
+        "name": "Tesla Model 3",
+        "description": "Electric sedan with autopilot and premium interior",
+        "price_per_day": 120,
+        "type": "Electric",
+        "seats": 5,
+        "image_url": "https://images.unsplash.com/photo-1560958089-b8a1929cea89?w=400",
+        "available": True,
+    },
+    {
+        "id": "car-2",
+        "name": "BMW X5",
+        "description": "Luxury SUV with advanced safety features",
+        "price_per_day": 150,
+        "type": "SUV",
+        "seats": 7,
+        "image_url": "https://images.unsplash.com/photo-1555215695-3004980ad54e?w=400",
+        "available": True,
+    },
+    {
+        "id": "car-3",
+        "name": "Honda Civic",
+        "description": "Reliable and fuel-efficient compact car",
+        "price_per_day": 45,
+        "type": "Compact",
+        "seats": 5,
+        "image_url": "https://images.unsplash.com/photo-1590362891991-f776e747a588?w=400",
+        "available": True,
+    },
+    {
+        "id": "car-4",
+        "name": "Ford Mustang",
+        "description": "Iconic sports car with powerful performance",
+        "price_per_day": 95,
+        "type": "Sports",
+        "seats": 4,
+        "image_url": "https://images.unsplash.com/photo-1584345604476-8ec5f8f2c8c2?w=400",
+        "available": False,
+    },
+)
+
+_LAPTOPS: tuple[ProductData, ...] = (
+    {
+        "name": "MacBook Pro 16\"",
+        "price": 2499,
+        "cpu": "M3 Max",
+        "ram": "32GB",
+        "storage": "1TB SSD",
+        "display": "16.2\" Retina",
+        "rating": 4.8,
+    },
+    {
+        "name": "Dell XPS 15",
+        "price": 1899,
+        "cpu": "Intel i9",
+        "ram": "32GB",
+        "storage": "1TB SSD",
+        "display": "15.6\" OLED",
+        "rating": 4.6,
+    },
+    {
+        "name": "Lenovo ThinkPad X1",
+        "price": 1699,
+        "cpu": "Intel i7",
+        "ram": "16GB",
+        "storage": "512GB SSD",
+        "display": "14\" IPS",
+        "rating": 4.5,
+    },
+    {
+        "name": "ASUS ROG Zephyrus",
+        "price": 2199,
+        "cpu": "AMD Ryzen 9",
+        "ram": "32GB",
+        "storage": "1TB SSD",
+        "display": "15.6\" QHD",
+        "rating": 4.7,
+    },
+)
+
+_DASHBOARD_METRICS: DashboardMetrics = {
+    "totalSales": 125000,
+    "newCustomers": 234,
+    "activeProjects": 12,
+    "salesTrend": "+12.5%",
+    "customerTrend": "+8.3%",
+    "projectStatus": "On Track",
+}
+
+_MARKET_SHARE: tuple[dict, ...] = (
+    {"company": "Company A", "share": 35},
+    {"company": "Company B", "share": 28},
+    {"company": "Company C", "share": 22},
+    {"company": "Company D", "share": 15},
+)
+
+# ============================================================================
+# PRE-ENCODED PAYLOADS
+# ============================================================================
+# agno sends tool results to the model as strings. The mock datasets never
+# change, so they are encoded once here and the tools return the text as-is.
+
+def _dumps(data) -> str:
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, separators=(",", ":"))
+
+_REVENUE_MONTHLY_JSON = _dumps(_REVENUE_MONTHLY)
+_REVENUE_JSON_BY_PERIOD = {
+    period: _dumps(data) for period, data in _REVENUE_BY_PERIOD.items()
+}
+_RENTAL_CARS_JSON = _dumps(_RENTAL_CARS)
+_LAPTOPS_JSON = _dumps(_LAPTOPS)
+_DASHBOARD_METRICS_JSON = _dumps(_DASHBOARD_METRICS)
+_MARKET_SHARE_JSON = _dumps(_MARKET_SHARE)
+
 # ============================================================================
 # BACKEND DATA FETCHING TOOLS (execute on backend)
 # ============================================================================
 
 @tool
-def get_revenue_data(period: str = "monthly") -> list[RevenueData]:
+def get_revenue_data(period: str = "monthly") -> str:
     """
     Fetch revenue data from the database.
 
@@ -72,29 +280,13 @@ def get_revenue_data(period: str = "monthly") -> list[RevenueData]:
         period: The time period ("monthly", "quarterly", "yearly")
 
     Returns:
-        List of revenue data with month, revenue, and expenses
+        JSON list of revenue data with month, revenue, and expenses
     """
     # Mock data - in production, fetch from database
-    if period == "quarterly":
-        return [
-            {"month": "Q1", "revenue": 18000, "expenses": 10500},
-            {"month": "Q2", "revenue": 21000, "expenses": 12000},
-            {"month": "Q3", "revenue": 24000, "expenses": 13500},
-            {"month": "Q4", "revenue": 27000, "expenses": 15000},
-        ]
-
-    # Default: monthly
-    return [
-        {"month": "Jan", "revenue": 5000, "expenses": 3000},
-        {"month": "Feb", "revenue": 6000, "expenses": 3500},
-        {"month": "Mar", "revenue": 7000, "expenses": 4000},
-        {"month": "Apr", "revenue": 7500, "expenses": 4200},
-        {"month": "May", "revenue": 8000, "expenses": 4500},
-        {"month": "Jun", "revenue": 8500, "expenses": 4800},
-    ]
+    return _REVENUE_JSON_BY_PERIOD.get(period, _REVENUE_MONTHLY_JSON)
 
 @tool
-def get_rental_cars(location: str = "San Francisco") -> list[CarData]:
+def get_rental_cars(location: str = "San Francisco") -> str:
     """
     Fetch available rental cars from the database.
 
@@ -102,54 +294,13 @@ def get_rental_cars(location: str = "San Francisco") -> list[CarData]:
         location: City or location for car search
 
     Returns:
-        List of available rental cars with details
+        JSON list of available rental cars with details
     """
     # Mock data - in production, fetch from database or MCP server
-    return [
-        {
-            "id": "car-1",
-            "name": "Tesla Model 3",
-            "description": "Electric sedan with autopilot and premium interior",
-            "price_per_day": 120,
-            "type": "Electric",
-            "seats": 5,
-            "image_url": "https://images.unsplash.com/photo-1560958089-b8a1929cea89?w=400",
-            "available": True,
-        },
-        {
-            "id": "car-2",
-            "name": "BMW X5",
-            "description": "Luxury SUV with advanced safety features",
-            "price_per_day": 150,
-            "type": "SUV",
-            "seats": 7,
-            "image_url": "https://images.unsplash.com/photo-1555215695-3004980ad54e?w=400",
-            "available": True,
-        },
-        {
-            "id": "car-3",
-            "name": "Honda Civic",
-            "description": "Reliable and fuel-efficient compact car",
-            "price_per_day": 45,
-            "type": "Compact",
-            "seats": 5,
-            "image_url": "https://images.unsplash.com/photo-1590362891991-f776e747a588?w=400",
-            "available": True,
-        },
-        {
-            "id": "car-4",
-            "name": "Ford Mustang",
-            "description": "Iconic sports car with powerful performance",
-            "price_per_day": 95,
-            "type": "Sports",
-            "seats": 4,
-            "image_url": "https://images.unsplash.com/photo-1584345604476-8ec5f8f2c8c2?w=400",
-            "available": False,
-        },
-    ]
+    return _RENTAL_CARS_JSON
 
 @tool
-def get_laptop_comparison(category: str = "laptops") -> list[ProductData]:
+def get_laptop_comparison(category: str = "laptops") -> str:
     """
     Fetch product comparison data from the database.
 
@@ -157,50 +308,13 @@ def get_laptop_comparison(category: str = "laptops") -> list[ProductData]:
         category: Product category to compare
 
     Returns:
-        List of products with specifications
+        JSON list of products with specifications
     """
     # Mock data - in production, fetch from database or API
-    return [
-        {
-            "name": "MacBook Pro 16\"",
-            "price": 2499,
-            "cpu": "M3 Max",
-            "ram": "32GB",
-            "storage": "1TB SSD",
-            "display": "16.2\" Retina",
-            "rating": 4.8,
-        },
-        {
-            "name": "Dell XPS 15",
-            "price": 1899,
-            "cpu": "Intel i9",
-            "ram": "32GB",
-            "storage": "1TB SSD",
-            "display": "15.6\" OLED",
-            "rating": 4.6,
-        },
-        {
-            "name": "Lenovo ThinkPad X1",
-            "price": 1699,
-            "cpu": "Intel i7",
-            "ram": "16GB",
-            "storage": "512GB SSD",
-            "display": "14\" IPS",
-            "rating": 4.5,
-        },
-        {
-            "name": "ASUS ROG Zephyrus",
-            "price": 2199,
-            "cpu": "AMD Ryzen 9",
-            "ram": "32GB",
-            "storage": "1TB SSD",
-            "display": "15.6\" QHD",
-            "rating": 4.7,
-        },
-    ]
+    return _LAPTOPS_JSON
 
 @tool
-def get_dashboard_metrics(userId: str = "user123") -> DashboardMetrics:
+def get_dashboard_metrics(userId: str = "user123") -> str:
     """
     Fetch dashboard metrics from analytics database.
 
@@ -208,33 +322,21 @@ def get_dashboard_metrics(userId: str = "user123") -> DashboardMetrics:
         userId: User ID for personalized metrics
 
     Returns:
-        Dictionary with dashboard metrics
+        JSON object with dashboard metrics
     """
     # Mock data - in production, fetch from analytics database
-    return {
-        "totalSales": 125000,
-        "newCustomers": 234,
-        "activeProjects": 12,
-        "salesTrend": "+12.5%",
-        "customerTrend": "+8.3%",
-        "projectStatus": "On Track",
-    }
+    return _DASHBOARD_METRICS_JSON
 
 @tool
-def get_market_share_data() -> list[dict]:
+def get_market_share_data() -> str:
     """
     Fetch market share data for visualization.
 
     Returns:
-        List of market share data by company
+        JSON list of market share data by company
     """
     # Mock data - in production, fetch from market research database
-    return [
-        {"company": "Company A", "share": 35},
-        {"company": "Company B", "share": 28},
-        {"company": "Company C", "share": 22},
-        {"company": "Company D", "share": 15},
-    ]
+    return _MARKET_SHARE_JSON
 
 # ============================================================================
 # FRONTEND RENDERING TOOLS (execute on frontend)
@@ -251,10 +353,10 @@ def render_revenue_chart(
 ):
     """
     Render a revenue chart on the frontend.
-    Backend must fetch the revenue data first using get_revenue_data and pass it here.
+    Pass the prefetched revenue data from context (or from get_revenue_data).
 
     Args:
-        data: Revenue data to render (fetched from get_revenue_data)
+        data: Revenue data to render (prefetched, or fetched from get_revenue_data)
         period: Time period for the chart
         chartType: Chart type ("auto", "line", "bar", "trend")
     """
@@ -264,10 +366,10 @@ def render_revenue_chart(
 def render_rental_cars(data: list[CarData], location: str = "San Francisco"):
     """
     Render rental cars as an interactive card grid on the frontend.
-    Backend must fetch car data first using get_rental_cars and pass it here.
+    Pass the prefetched car data from context (or from get_rental_cars).
 
     Args:
-        data: Car data to render (fetched from get_rental_cars)
+        data: Car data to render (prefetched, or fetched from get_rental_cars)
         location: Location where cars are available
     """
     pass  # No implementation - executes on frontend
@@ -276,10 +378,10 @@ def render_rental_cars(data: list[CarData], location: str = "San Francisco"):
 def render_product_comparison(data: list[ProductData], category: str = "products"):
     """
     Render product comparison table on the frontend.
-    Backend must fetch product data first using get_laptop_comparison and pass it here.
+    Pass the prefetched product data from context (or from get_laptop_comparison).
 
     Args:
-        data: Product data to render (fetched from get_laptop_comparison)
+        data: Product data to render (prefetched, or fetched from get_laptop_comparison)
         category: Product category being compared
     """
     pass  # No implementation - executes on frontend
@@ -288,10 +390,10 @@ def render_product_comparison(data: list[ProductData], category: str = "products
 def render_dashboard(data: DashboardMetrics, userId: str = None):
     """
     Render a dashboard with key metrics on the frontend.
-    Backend must fetch metrics first using get_dashboard_metrics and pass it here.
+    Pass the prefetched metrics from context (or from get_dashboard_metrics).
 
     Args:
-        data: Dashboard metrics to render (fetched from get_dashboard_metrics)
+        data: Dashboard metrics to render (prefetched, or fetched from get_dashboard_metrics)
         userId: Optional user ID for personalization
     """
     pass  # No implementation - executes on frontend
@@ -300,7 +402,7 @@ def render_dashboard(data: DashboardMetrics, userId: str = None):
 def render_visualization(data: list[dict], query: str = "Data", chartType: str = None):
     """
     Render data visualization with smart chart type detection on the frontend.
-    Backend must fetch data first and pass it here.
+    Pass prefetched data from context, or fetch it first and pass it here.
 
     Args:
         data: Data to visualize
@@ -319,80 +421,275 @@ def show_alert(content: str):
     """
     pass  # No implementation - executes on frontend
 
+# ============================================================================
+# RESPONSE COMPRESSION
+# ============================================================================
+# Run streams are SSE frames of repetitive JSON (tool arguments carry the full
+# records), so they compress well. Each chunk is flushed as it is compressed
+# so events still reach the client as soon as they are produced.
+
+def _accepted_encodings(accept_encoding: str) -> set[str]:
+    """Codings listed in an Accept-Encoding header, minus those sent with q=0."""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        coding = coding.strip().lower()
+        if coding and quality > 0:
+            accepted.add(coding)
+    return accepted
+
+class StreamingCompressionMiddleware:
+    """ASGI middleware compressing responses with zstd, or gzip as a fallback."""
+
+    def __init__(self, app, minimum_size: int = 500):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = _accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if zstandard is not None and "zstd" in accepted:
+            encoding = "zstd"
+        elif "gzip" in accepted:
+            encoding = "gzip"
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor = None
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor
+
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk decides whether to compress
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                if "content-encoding" in headers or (
+                    not more_body and len(body) < self.minimum_size
+                ):
+                    await send(start_message)
+                    start_message = None
+                    await send(message)
+                    return
+
+                if encoding == "zstd":
+                    compressor = zstandard.ZstdCompressor(level=3).compressobj()
+                else:
+                    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+                headers["content-encoding"] = encoding
+                headers.add_vary_header("accept-encoding")
+                del headers["content-length"]
+                await send(start_message)
+                start_message = None
+
+            if compressor is None:
+                await send(message)
+                return
+
+            data = compressor.compress(body)
+            if more_body:
+                data += compressor.flush(
+                    zstandard.COMPRESSOBJ_FLUSH_BLOCK if encoding == "zstd" else zlib.Z_SYNC_FLUSH
+                )
+            else:
+                data += compressor.flush()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
 # ============================================================================
 # AGENT CONFIGURATION
 # ============================================================================
 
+_TOOLS = [
+    # Backend data fetching tools
+    get_revenue_data,
+    get_rental_cars,
+    get_laptop_comparison,
+    get_dashboard_metrics,
+    get_market_share_data,
+
+    # Frontend rendering tools
+    render_revenue_chart,
+    render_rental_cars,
+    render_product_comparison,
+    render_dashboard,
+    render_visualization,
+    show_alert,
+]
+
+def _freeze_tool_schemas(tools) -> None:
+    """Reuse the schemas @tool already built instead of rebuilding them per run."""
+    for function in tools:
+        function.skip_entrypoint_processing = True
+
+# @tool builds each parameter schema when the function is decorated. Without
+# this flag agno rebuilds it (signature, type hints, JSON schema) every time
+# it prepares the tools for a run.
+_freeze_tool_schemas(_TOOLS)
+
+# Snapshot of every mock dataset, appended to the system message. With the
+# data already in context the model calls render_* directly instead of
+# waiting on a get_* round-trip first.
+_PREFETCHED_DATA = "\n".join([
+    "<prefetched_data>",
+    f"get_revenue_data(period='monthly'): {_REVENUE_MONTHLY_JSON}",
+    f"get_revenue_data(period='quarterly'): {_REVENUE_JSON_BY_PERIOD['quarterly']}",
+    f"get_rental_cars(): {_RENTAL_CARS_JSON}",
+    f"get_laptop_comparison(): {_LAPTOPS_JSON}",
+    f"get_dashboard_metrics(): {_DASHBOARD_METRICS_JSON}",
+    f"get_market_share_data(): {_MARKET_SHARE_JSON}",
+    "</prefetched_data>",
+])
+
+# Static instructions, joined once at import. agno inserts a plain string
+# into the system message verbatim, so every turn sends identical bytes.
+_INSTRUCTIONS = "\n".join([
+    "You are a helpful AI assistant that creates beautiful, interactive visualizations.",
+    "",
+    "CRITICAL WORKFLOW:",
+    "1. The results of the get_* tools are already in <prefetched_data> - do NOT call get_* for that data",
+    "2. Pass the prefetched data straight to the appropriate render_* tool in a single call",
+    "3. Only call a get_* tool when the user asks for data that is not prefetched",
+    "",
+    "Examples:",
+    "- User: 'Show revenue' → call render_revenue_chart(data=<prefetched monthly revenue>)",
+    "- User: 'Show rental cars' → call render_rental_cars(data=<prefetched rental cars>)",
+    "- User: 'Compare laptops' → call render_product_comparison(data=<prefetched laptops>)",
+    "- User: 'Show my dashboard' → call render_dashboard(data=<prefetched dashboard metrics>)",
+    "- User: 'Visualize market share' → call render_visualization(data=<prefetched market share>, chartType='pie')",
+    "",
+    "The render_* tools execute on the FRONTEND and create interactive UI components.",
+    "Always explain what you're showing and offer to adjust the visualization.",
+])
+
 assistant = Agent(
     name="generative-ui-demo",
     db=db,
-    tools=[
-        # Backend data fetching tools
-        get_revenue_data,
-        get_rental_cars,
-        get_laptop_comparison,
-        get_dashboard_metrics,
-        get_market_share_data,
-
-        # Frontend rendering tools
-        render_revenue_chart,
-        render_rental_cars,
-        render_product_comparison,
-        render_dashboard,
-        render_visualization,
-        show_alert,
-    ],
-    model=Claude(id="claude-sonnet-4-5"),
+    tools=_TOOLS,
+    # Marks the end of the system block with cache_control. Anthropic orders
+    # the prompt as tools, then system, so this one breakpoint caches the tool
+    # schemas together with the instructions and the prefetched data. That
+    # only pays off while everything before the breakpoint is byte-identical
+    # across turns: keep the _TOOLS order fixed and keep per-turn content
+    # (session summaries, datetime, session state) out of the system message.
+    model=Claude(id="claude-sonnet-4-5", cache_system_prompt=True),
     description="AI assistant that demonstrates generative UI capabilities with interactive charts, cards, tables, and visualizations.",
-    instructions=[
-        "You are a helpful AI assistant that creates beautiful, interactive visualizations.",
-        "",
-        "CRITICAL WORKFLOW:",
-        "1. When user asks for data visualization, FIRST fetch the data using the appropriate get_* tool",
-        "2. THEN pass that data to the appropriate render_* tool for frontend display",
-        "",
-        "Examples:",
-        "- User: 'Show revenue' → call get_revenue_data() → call render_revenue_chart(data=result)",
-        "- User: 'Show rental cars' → call get_rental_cars() → call render_rental_cars(data=result)",
-        "- User: 'Compare laptops' → call get_laptop_comparison() → call render_product_comparison(data=result)",
-        "- User: 'Show my dashboard' → call get_dashboard_metrics() → call render_dashboard(data=result)",
-        "- User: 'Visualize market share' → call get_market_share_data() → call render_visualization(data=result, chartType='pie')",
-        "",
-        "The render_* tools execute on the FRONTEND and create interactive UI components.",
-        "Always explain what you're showing and offer to adjust the visualization.",
-    ],
+    instructions=_INSTRUCTIONS,
+    additional_context=_PREFETCHED_DATA,
+    # Bounded history: only the last few runs are replayed, so the prompt
+    # stops growing with the conversation
     add_history_to_context=True,
+    num_history_runs=5,
     markdown=True,
-    debug_mode=True,
-    debug_level=2,
+    debug_mode=DEBUG,
+    debug_level=2 if DEBUG else 1,
 )
 
+@asynccontextmanager
+async def lifespan(app):
+    """Warm the database pool and the Anthropic connection before serving."""
+    # Opens the first pooled connection, which also applies the WAL pragmas
+    async with db_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    # Cheapest authenticated call: sets up the client and its TLS connection.
+    # Bounded so an unreachable API cannot hold up startup.
+    try:
+        client = assistant.model.get_async_client().with_options(max_retries=0, timeout=5)
+        await client.models.list(limit=1)
+    except Exception as exc:
+        logger.warning("Anthropic warm-up failed, first request will connect: %s", exc)
+
+    yield
+
 agent_os = AgentOS(
     id="generative-ui-demo",
     description="Demo of generative UI capabilities with interactive visualizations",
     agents=[assistant],
+    lifespan=lifespan,
 )
 
 app = agent_os.get_app()
+app.add_middleware(StreamingCompressionMiddleware)
+
+_RULE = "=" * 70
+
+BANNER = f"""
+{_RULE}
+🎨 Generative UI Demo Agent
+{_RULE}
+
+This agent demonstrates all generative UI capabilities:
+  • Revenue charts (bar/line)
+  • Rental car cards
+  • Product comparison tables
+  • Dashboard metrics
+  • Smart data visualization
+
+Starting server on http://localhost:7777
+
+Example prompts to try:
+  • 'Show me monthly revenue'
+  • 'What rental cars are available?'
+  • 'Compare laptops'
+  • 'Show my dashboard'
+  • 'Visualize market share data'
+
+{_RULE}
+
+"""
 
 if __name__ == "__main__":
-    print("\n" + "="*70)
-    print("🎨 Generative UI Demo Agent")
-    print("="*70)
-    print("\nThis agent demonstrates all generative UI capabilities:")
-    print("  • Revenue charts (bar/line)")
-    print("  • Rental car cards")
-    print("  • Product comparison tables")
-    print("  • Dashboard metrics")
-    print("  • Smart data visualization")
-    print("\nStarting server on http://localhost:7777")
-    print("\nExample prompts to try:")
-    print("  • 'Show me monthly revenue'")
-    print("  • 'What rental cars are available?'")
-    print("  • 'Compare laptops'")
-    print("  • 'Show my dashboard'")
-    print("  • 'Visualize market share data'")
-    print("\n" + "="*70 + "\n")
-
-    # Default port is 7777; change with port=...
-    agent_os.serve(app="examples.mock-agent:app", reload=True)
+    sys.stdout.write(BANNER)
+
+    # One process per core unless auto-reload is on
+    reload = os.getenv("AGENT_RELOAD") == "1"
+    workers = 1 if reload else os.cpu_count() or 1
+
+    if Granian is not None:
+        # Rust HTTP core: lower per-chunk overhead on the SSE token stream
+        Granian(
+            "examples.mock-agent:app",
+            address="127.0.0.1",  # Granian only accepts IP literals
+            port=7777,
+            interface=Interfaces.ASGI,
+            http=HTTPModes.auto,
+            workers=workers,
+            reload=reload,
+        ).serve()
+    else:
+        # "auto" picks uvloop + httptools over the asyncio/h11 defaults when
+        # they are installed
+        uvicorn.run(
+            "examples.mock-agent:app",
+            host="localhost",
+            port=7777,
+            loop="auto",
+            http="auto",
+            reload=reload,
+            workers=workers,
+        )